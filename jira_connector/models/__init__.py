@@ -1,3 +1,4 @@
 from . import jira_config
 from . import jira_project
+from . import jira_issue_snapshot
 from . import helpdesk_ticket
@@ -12,8 +12,10 @@ class HelpdeskTicket(models.Model):
     jira_id = fields.Char('Jira ID')
     jira_status = fields.Char('Jira Status')
     is_jira_ticket = fields.Boolean('Is Jira Ticket')
+    jira_deleted = fields.Boolean('Deleted in Jira', readonly=True)
     jira_priority = fields.Char('Jira Priority') 
     jira_created_date = fields.Datetime('Jira Created Date') 
+    jira_updated_date = fields.Datetime('Jira Updated Date')
     jira_comments = fields.Html('Jira Comments', readonly=True, sanitize=False)
     new_jira_comment = fields.Text('New Comment')
 
@@ -1,6 +1,7 @@
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from odoo import models, fields, api, _
-from odoo.exceptions import UserError
+from odoo.exceptions import AccessError, UserError
 import requests
 import base64
 import json
@@ -22,6 +23,7 @@ class JiraConfiguration(models.Model):
     is_active = fields.Boolean('Active', default=True, tracking=True)
     company_id = fields.Many2one('res.company', default=lambda self: self.env.company)
     last_sync_date = fields.Datetime('Last Sync', readonly=True)
+    replay_requested = fields.Boolean('Replay Requested', readonly=True)
 
     _sql_constraints = [
         ('unique_active_config',
@@ -63,24 +65,168 @@ class JiraConfiguration(models.Model):
         except requests.exceptions.RequestException as e:
             raise UserError(f"Jira API request failed: {str(e)}")
 
-    def sync_jira_projects(self):
-        response = self._make_request('project')
-        if response.status_code == 200:
-            projects = response.json()
-            ProjectModel = self.env['project.project']
-            
+    def _iter_jira_project_pages(self, batch_size=50):
+        start_at = 0
+        while True:
+            response = self._make_request(f'project/search?startAt={start_at}&maxResults={batch_size}')
+            if response.status_code != 200:
+                _logger.error(f"Jira API Error: {response.status_code}, Response: {response.text}")
+                raise UserError("Failed to fetch Jira projects. Check logs for details.")
+
+            data = response.json()
+            projects = data.get('values', [])
+            if not projects:
+                break
+            yield projects
+
+            start_at += len(projects)
+            if data.get('isLast', True):
+                break
+
+    def sync_jira_projects(self, batch_size=50):
+        ProjectModel = self.env['project.project'].with_context(from_jira_sync=True)
+        seen_keys = set()
+        new_vals = []
+
+        for projects in self._iter_jira_project_pages(batch_size):
+            # Prefetch every stored project of this page in a single query
+            existing_projects = {
+                project.jira_key: project
+                for project in ProjectModel.with_context(active_test=False).search([
+                    ('jira_key', 'in', [project['key'] for project in projects])
+                ])
+            }
+
             for project in projects:
-                existing_project = ProjectModel.search([('jira_key', '=', project['key'])], limit=1)
+                # Skip keys already handled on an earlier page
+                if project['key'] in seen_keys:
+                    continue
+                seen_keys.add(project['key'])
+
                 project_vals = {
                     'name': project['name'],
                     'jira_key': project['key'],
                     'jira_id': project['id'],
                     'is_jira_project': True,
                 }
+                existing_project = existing_projects.get(project['key'])
                 if existing_project:
-                    existing_project.write(project_vals)
+                    # Only write the values Jira actually changed
+                    changed_vals = {
+                        key: value for key, value in project_vals.items()
+                        if existing_project[key] != value
+                    }
+                    if changed_vals:
+                        existing_project.write(changed_vals)
                 else:
-                    ProjectModel.create(project_vals)
+                    new_vals.append(project_vals)
+
+        # Create the new projects of every page in one batch
+        if new_vals:
+            ProjectModel.create(new_vals)
+
+    def _reconcile_jira_tickets(self, batch_size=1000, max_orphan_ratio=0.5, min_orphan_count=10):
+        # Key-only scan: Jira allows large pages when only the key is requested
+        remote_keys = {}
+        scanned_project_keys = set()
+        # Tickets synced while the scan runs may belong to issues created after it
+        scan_started_at = fields.Datetime.now()
+        for projects in self._iter_jira_project_pages():
+            for project in projects:
+                scanned_project_keys.add(project['key'])
+                start_at = 0
+                while True:
+                    response = self._make_request(
+                        f'search?jql=project={project["key"]}&fields=key&startAt={start_at}&maxResults={batch_size}'
+                    )
+                    if response.status_code != 200:
+                        _logger.error(f"Jira API Error: {response.status_code}, Response: {response.text}")
+                        raise UserError("Failed to fetch Jira issue keys. Check logs for details.")
+
+                    data = response.json()
+                    issues = data.get('issues', [])
+                    if not issues:
+                        break
+                    for issue in issues:
+                        remote_keys[issue['id']] = issue['key']
+
+                    start_at += len(issues)
+                    if start_at >= data.get('total', 0):
+                        break
+
+        # An empty scan means lost access rather than every issue being deleted
+        if not remote_keys:
+            _logger.warning("Jira reconciliation skipped: no remote issues returned")
+            return
+
+        remote_key_set = set(remote_keys.values())
+        HelpdeskTicket = self.env['helpdesk.ticket'].with_context(active_test=False, from_jira_sync=True)
+        local_tickets = HelpdeskTicket.search_read(
+            [('is_jira_ticket', '=', True)],
+            ['jira_id', 'jira_key', 'jira_deleted', 'active', 'create_date'],
+            order='id',
+        )
+
+        # A move seen by the ticket sync first leaves two tickets sharing one Jira id
+        ticket_groups = defaultdict(list)
+        for ticket in local_tickets:
+            ticket_groups[ticket['jira_id'] or f"key:{ticket['jira_key']}"].append(ticket)
+
+        checked_count = 0
+        orphan_ids = []
+        restored_ids = []
+        duplicate_ids = []
+        moved_keys = {}
+        for group in ticket_groups.values():
+            # Keep the oldest ticket, it carries the history
+            ticket = group[0]
+            duplicate_ids += [duplicate['id'] for duplicate in group[1:] if duplicate['active']]
+
+            if ticket['jira_id']:
+                remote_key = remote_keys.get(ticket['jira_id'])
+            else:
+                remote_key = ticket['jira_key'] if ticket['jira_key'] in remote_key_set else False
+
+            project_key = (ticket['jira_key'] or '').rsplit('-', 1)[0]
+            if not remote_key:
+                # Only tickets of projects that were actually scanned can be orphans
+                if (
+                    project_key in scanned_project_keys
+                    and not ticket['jira_deleted']
+                    and ticket['create_date'] < scan_started_at
+                ):
+                    checked_count += 1
+                    orphan_ids.append(ticket['id'])
+                continue
+            checked_count += 1
+
+            if ticket['jira_deleted']:
+                restored_ids.append(ticket['id'])
+            # Moved issues keep their id but get a new key
+            if remote_key != ticket['jira_key']:
+                moved_keys[ticket['id']] = remote_key
+
+        # A handful of deletions is always plausible, a large share of the tickets is not
+        if len(orphan_ids) > min_orphan_count and len(orphan_ids) > max_orphan_ratio * checked_count:
+            _logger.error(
+                f"Jira reconciliation aborted: {len(orphan_ids)} of {checked_count} tickets "
+                f"would be archived, check the Jira credentials and permissions"
+            )
+            return
+
+        if duplicate_ids:
+            HelpdeskTicket.browse(duplicate_ids).write({'active': False})
+        for ticket_id, remote_key in moved_keys.items():
+            HelpdeskTicket.browse(ticket_id).write({'jira_key': remote_key})
+        if orphan_ids:
+            HelpdeskTicket.browse(orphan_ids).write({'active': False, 'jira_deleted': True})
+        if restored_ids:
+            HelpdeskTicket.browse(restored_ids).write({'active': True, 'jira_deleted': False})
+
+        _logger.info(
+            f"Jira reconciliation: {len(remote_keys)} remote issues, {len(orphan_ids)} archived, "
+            f"{len(restored_ids)} restored, {len(moved_keys)} moved, {len(duplicate_ids)} duplicates archived"
+        )
 
     def _sync_jira_tickets(self, batch_size=100):
         jql_query = "ORDER BY updated DESC"
@@ -127,7 +273,7 @@ class JiraConfiguration(models.Model):
 
 
 
-    def _process_single_ticket(self, ticket, stage_cache, user_cache):
+    def _process_single_ticket(self, ticket, stage_cache, user_cache, comments=None, issue_data=None, offline=False):
         new_cr = self.pool.cursor()
         env = api.Environment(new_cr, self.env.uid, self.env.context)
         try:
@@ -202,6 +348,15 @@ class JiraConfiguration(models.Model):
                     created_date = fields.Datetime.now()
             else:
                 created_date = fields.Datetime.now()
+
+            updated_date = fields.get('updated')
+            if updated_date:
+                try:
+                    updated_date = datetime.strptime(updated_date, '%Y-%m-%dT%H:%M:%S.%f%z').astimezone(timezone.utc).replace(tzinfo=None)
+                except Exception as e:
+                    updated_date = False
+            else:
+                updated_date = False
                 
             # Initialize containers for comments and attachments
             comments_text = """
@@ -219,104 +374,120 @@ class JiraConfiguration(models.Model):
             
             # Process comments
             try:
-                comments_response = self._make_request(f'issue/{ticket["key"]}/comment')
-                if comments_response.status_code == 200:
-                    comments = comments_response.json().get('comments', [])
-                    # _logger.info(f"Found {len(comments)} comments for ticket {ticket['key']}")
-                    if comments:
-                        for comment in reversed(comments):
-                            body = comment.get('body', '')
-                            comment_attachments = []
-                            
-                            # _logger.debug(f"Raw comment data for {ticket['key']} (ID: {comment['id']}): {comment}")
-                            # _logger.debug(f"Comment body for {ticket['key']} (ID: {comment['id']}): {body}")
-                            
-                            if isinstance(body, dict):
-                                text_content = '\n'.join(
-                                    item.get('text', '')
-                                    for content in body.get('content', [])
-                                    for item in content.get('content', [])
-                                    if item.get('type') == 'text'
-                                ) or ''
-                                
-                                for content in body.get('content', []):
-                                    if content.get('type') in ['mediaGroup', 'attachment', 'file', 'media']:
-                                        for item in content.get('content', []):
-                                            if item.get('type') in ['media', 'file']:
-                                                attachment_url = item.get('attrs', {}).get('url', '')
-                                                attachment_name = item.get('attrs', {}).get('name', '')
-                                                # _logger.info(f"Detected ADF comment attachment: {attachment_name} with URL: {attachment_url}")
-                                                if attachment_url:
-                                                    try:
-                                                        attachment_response = self._make_request(attachment_url, stream=True)
-                                                        if attachment_response.status_code == 200:
-                                                            attachment_data = base64.b64encode(attachment_response.content).decode('utf-8')
-                                                            # Create attachment immediately to get ID
-                                                            attachment_record = env['ir.attachment'].create({
-                                                                'name': attachment_name or f"attachment_{comment['id']}",
-                                                                'datas': attachment_data,
-                                                                'mimetype': attachment_response.headers.get('Content-Type', 'application/octet-stream'),
-                                                                'res_model': 'helpdesk.ticket',
-                                                                'res_id': ticket_id if 'ticket_id' in locals() else 0,  # Temporary 0, updated later
-                                                            })
-                                                            # _logger.info(f"Created comment attachment {attachment_name} (ID: {attachment_record.id})")
-                                                            attachment_link = f"/web/content/{attachment_record.id}?download=true"
-                                                            comment_attachments.append({'name': attachment_name, 'link': attachment_link})
-                                                            all_attachments.append({'name': attachment_name, 'link': attachment_link})
-                                                        else:
-                                                            _logger.error(f"Failed to download ADF comment attachment {attachment_url}: Status {attachment_response.status_code}")
-                                                    except UserError as e:
-                                                        _logger.error(f"UserError downloading ADF comment attachment {attachment_url}: {str(e)}")
-                                                    except Exception as e:
-                                                        _logger.error(f"Error downloading ADF comment attachment {attachment_url}: {str(e)}")
-                                body = text_content
-                            elif isinstance(body, str):
-                                body = body.strip()
-                                url_pattern = r'(https?://[^\s]+\.(?:jpg|jpeg|png|gif|pdf|docx?|xlsx?|zip))'
-                                attachment_urls = re.findall(url_pattern, body)
-                                if attachment_urls:
-                                    for attachment_url in attachment_urls:
-                                        guessed_name = attachment_url.split('/')[-1]
-                                        # _logger.info(f"Detected potential attachment URL in comment: {guessed_name} with URL: {attachment_url}")
-                                        try:
-                                            attachment_response = self._make_request(attachment_url, stream=True)
-                                            if attachment_response.status_code == 200:
-                                                attachment_data = base64.b64encode(attachment_response.content).decode('utf-8')
-                                                # Create attachment immediately to get ID
-                                                attachment_record = env['ir.attachment'].create({
-                                                    'name': guessed_name or f"attachment_{comment['id']}",
-                                                    'datas': attachment_data,
-                                                    'mimetype': attachment_response.headers.get('Content-Type', 'application/octet-stream'),
-                                                    'res_model': 'helpdesk.ticket',
-                                                    'res_id': ticket_id if 'ticket_id' in locals() else 0,  # Temporary 0, updated later
-                                                })
-                                                # _logger.info(f"Created comment attachment {guessed_name} (ID: {attachment_record.id})")
-                                                attachment_link = f"/web/content/{attachment_record.id}?download=true"
-                                                comment_attachments.append({'name': guessed_name, 'link': attachment_link})
-                                                all_attachments.append({'name': guessed_name, 'link': attachment_link})
-                                                body = body.replace(attachment_url, '')
-                                            else:
-                                                _logger.error(f"Failed to download comment attachment URL {attachment_url}: Status {attachment_response.status_code}")
-                                        except UserError as e:
-                                            _logger.error(f"UserError downloading comment attachment URL {attachment_url}: {str(e)}")
-                                        except Exception as e:
-                                            _logger.error(f"Error downloading comment attachment URL {attachment_url}: {str(e)}")
+                if comments is None:
+                    comments_response = self._make_request(f'issue/{ticket["key"]}/comment')
+                    if comments_response.status_code == 200:
+                        comments = comments_response.json().get('comments', [])
+                    else:
+                        _logger.error(f"Failed to fetch comments for {ticket['key']}: Status {comments_response.status_code}")
+                # _logger.info(f"Found {len(comments)} comments for ticket {ticket['key']}")
+                if comments:
+                    for comment in reversed(comments):
+                        body = comment.get('body', '')
+                        comment_attachments = []
+                        
+                        # _logger.debug(f"Raw comment data for {ticket['key']} (ID: {comment['id']}): {comment}")
+                        # _logger.debug(f"Comment body for {ticket['key']} (ID: {comment['id']}): {body}")
+                        
+                        if isinstance(body, dict):
+                            text_content = '\n'.join(
+                                item.get('text', '')
+                                for content in body.get('content', [])
+                                for item in content.get('content', [])
+                                if item.get('type') == 'text'
+                            ) or ''
                             
-                            author = comment.get('author', {}).get('displayName', 'Unknown')
-                            comment_created = datetime.strptime(comment['created'], '%Y-%m-%dT%H:%M:%S.%f%z').strftime('%Y-%m-%d %H:%M:%S')
-                            
-                            if body.strip():
-                                comments_text += f"""
-                                    <div class="jira-comment" style="background-color: white; margin-bottom: 15px; padding: 15px; border-radius: 6px; box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
-                                        <p class="comment-header" style="margin: 0 0 10px 0; color: #666; font-size: 0.9em;">
-                                            <strong style="color: #2c5282;">{author}</strong>
-                                            <span style="color: #718096;"> - {comment_created}</span>
-                                        </p>
-                                        <p class="comment-body" style="margin: 0; line-height: 1.5; color: #2d3748; white-space: pre-wrap;">{body}</p>
-                                    </div>
-                                """
-                else:
-                    _logger.error(f"Failed to fetch comments for {ticket['key']}: Status {comments_response.status_code}")
+                            for content in body.get('content', []):
+                                if content.get('type') in ['mediaGroup', 'attachment', 'file', 'media']:
+                                    for item in content.get('content', []):
+                                        if item.get('type') in ['media', 'file']:
+                                            attachment_url = item.get('attrs', {}).get('url', '')
+                                            attachment_name = item.get('attrs', {}).get('name', '')
+                                            # _logger.info(f"Detected ADF comment attachment: {attachment_name} with URL: {attachment_url}")
+                                            if attachment_url:
+                                                if offline:
+                                                    attachment_record = self._find_synced_attachment(env, ticket, attachment_name)
+                                                    if attachment_record:
+                                                        attachment_link = f"/web/content/{attachment_record.id}?download=true"
+                                                        comment_attachments.append({'name': attachment_name, 'link': attachment_link})
+                                                        all_attachments.append({'name': attachment_name, 'link': attachment_link})
+                                                    continue
+                                                try:
+                                                    attachment_response = self._make_request(attachment_url, stream=True)
+                                                    if attachment_response.status_code == 200:
+                                                        attachment_data = base64.b64encode(attachment_response.content).decode('utf-8')
+                                                        # Create attachment immediately to get ID
+                                                        attachment_record = env['ir.attachment'].create({
+                                                            'name': attachment_name or f"attachment_{comment['id']}",
+                                                            'datas': attachment_data,
+                                                            'mimetype': attachment_response.headers.get('Content-Type', 'application/octet-stream'),
+                                                            'res_model': 'helpdesk.ticket',
+                                                            'res_id': ticket_id if 'ticket_id' in locals() else 0,  # Temporary 0, updated later
+                                                        })
+                                                        # _logger.info(f"Created comment attachment {attachment_name} (ID: {attachment_record.id})")
+                                                        attachment_link = f"/web/content/{attachment_record.id}?download=true"
+                                                        comment_attachments.append({'name': attachment_name, 'link': attachment_link})
+                                                        all_attachments.append({'name': attachment_name, 'link': attachment_link})
+                                                    else:
+                                                        _logger.error(f"Failed to download ADF comment attachment {attachment_url}: Status {attachment_response.status_code}")
+                                                except UserError as e:
+                                                    _logger.error(f"UserError downloading ADF comment attachment {attachment_url}: {str(e)}")
+                                                except Exception as e:
+                                                    _logger.error(f"Error downloading ADF comment attachment {attachment_url}: {str(e)}")
+                            body = text_content
+                        elif isinstance(body, str):
+                            body = body.strip()
+                            url_pattern = r'(https?://[^\s]+\.(?:jpg|jpeg|png|gif|pdf|docx?|xlsx?|zip))'
+                            attachment_urls = re.findall(url_pattern, body)
+                            if attachment_urls:
+                                for attachment_url in attachment_urls:
+                                    guessed_name = attachment_url.split('/')[-1]
+                                    # _logger.info(f"Detected potential attachment URL in comment: {guessed_name} with URL: {attachment_url}")
+                                    if offline:
+                                        attachment_record = self._find_synced_attachment(env, ticket, guessed_name)
+                                        if attachment_record:
+                                            attachment_link = f"/web/content/{attachment_record.id}?download=true"
+                                            comment_attachments.append({'name': guessed_name, 'link': attachment_link})
+                                            all_attachments.append({'name': guessed_name, 'link': attachment_link})
+                                            body = body.replace(attachment_url, '')
+                                        continue
+                                    try:
+                                        attachment_response = self._make_request(attachment_url, stream=True)
+                                        if attachment_response.status_code == 200:
+                                            attachment_data = base64.b64encode(attachment_response.content).decode('utf-8')
+                                            # Create attachment immediately to get ID
+                                            attachment_record = env['ir.attachment'].create({
+                                                'name': guessed_name or f"attachment_{comment['id']}",
+                                                'datas': attachment_data,
+                                                'mimetype': attachment_response.headers.get('Content-Type', 'application/octet-stream'),
+                                                'res_model': 'helpdesk.ticket',
+                                                'res_id': ticket_id if 'ticket_id' in locals() else 0,  # Temporary 0, updated later
+                                            })
+                                            # _logger.info(f"Created comment attachment {guessed_name} (ID: {attachment_record.id})")
+                                            attachment_link = f"/web/content/{attachment_record.id}?download=true"
+                                            comment_attachments.append({'name': guessed_name, 'link': attachment_link})
+                                            all_attachments.append({'name': guessed_name, 'link': attachment_link})
+                                            body = body.replace(attachment_url, '')
+                                        else:
+                                            _logger.error(f"Failed to download comment attachment URL {attachment_url}: Status {attachment_response.status_code}")
+                                    except UserError as e:
+                                        _logger.error(f"UserError downloading comment attachment URL {attachment_url}: {str(e)}")
+                                    except Exception as e:
+                                        _logger.error(f"Error downloading comment attachment URL {attachment_url}: {str(e)}")
+                        
+                        author = comment.get('author', {}).get('displayName', 'Unknown')
+                        comment_created = datetime.strptime(comment['created'], '%Y-%m-%dT%H:%M:%S.%f%z').strftime('%Y-%m-%d %H:%M:%S')
+                        
+                        if body.strip():
+                            comments_text += f"""
+                                <div class="jira-comment" style="background-color: white; margin-bottom: 15px; padding: 15px; border-radius: 6px; box-shadow: 0 1px 3px rgba(0,0,0,0.1);">
+                                    <p class="comment-header" style="margin: 0 0 10px 0; color: #666; font-size: 0.9em;">
+                                        <strong style="color: #2c5282;">{author}</strong>
+                                        <span style="color: #718096;"> - {comment_created}</span>
+                                    </p>
+                                    <p class="comment-body" style="margin: 0; line-height: 1.5; color: #2d3748; white-space: pre-wrap;">{body}</p>
+                                </div>
+                            """
             except UserError as e:
                 _logger.error(f"UserError fetching comments for ticket {ticket['key']}: {str(e)}")
             except Exception as e:
@@ -324,9 +495,11 @@ class JiraConfiguration(models.Model):
             
             # Fallback: Check attachments via issue endpoint
             try:
-                attachments_response = self._make_request(f'issue/{ticket["key"]}')
-                if attachments_response.status_code == 200:
-                    issue_data = attachments_response.json()
+                if issue_data is None:
+                    attachments_response = self._make_request(f'issue/{ticket["key"]}')
+                    if attachments_response.status_code == 200:
+                        issue_data = attachments_response.json()
+                if issue_data:
                     attachments = issue_data.get('fields', {}).get('attachment', [])
                     if attachments:
                         # _logger.info(f"Found {len(attachments)} attachments via issue endpoint for {ticket['key']}")
@@ -335,6 +508,11 @@ class JiraConfiguration(models.Model):
                             attachment_name = attachment.get('filename', '')
                             # _logger.info(f"Detected issue endpoint attachment: {attachment_name} with URL: {attachment_url}")
                             if attachment_url:
+                                if offline:
+                                    attachment_record = self._find_synced_attachment(env, ticket, attachment_name)
+                                    if attachment_record:
+                                        all_attachments.append({'name': attachment_name, 'link': f"/web/content/{attachment_record.id}?download=true"})
+                                    continue
                                 try:
                                     attachment_response = self._make_request(attachment_url, stream=True)
                                     if attachment_response.status_code == 200:
@@ -397,14 +575,24 @@ class JiraConfiguration(models.Model):
                 'jira_status': jira_status,
                 'jira_priority': priority.get('name', '') if priority else '',
                 'jira_created_date': created_date,
+                'jira_updated_date': updated_date,
                 'stage_id': stage_id,
                 'is_jira_ticket': True,
                 'user_id': user_id or False,
                 'jira_comments': full_content,
             }
             
+            # Keep the raw Jira payload so mapping changes can be replayed offline,
+            # a failed fetch leaves comments or issue_data as None and is not stored
+            if not offline and comments is not None and issue_data is not None:
+                env['jira.issue.snapshot']._store_snapshot(issue_data, comments)
+
             # Create or update ticket
-            existing_ticket = HelpdeskTicket.search([('jira_key', '=', ticket.get('key'))], limit=1)
+            existing_ticket = self._find_existing_ticket(env, ticket)
+            # A sync may have run since the replay picked this snapshot
+            if offline and existing_ticket.jira_updated_date and updated_date and updated_date < existing_ticket.jira_updated_date:
+                _logger.info(f"Skipping stale Jira snapshot for {ticket.get('key', '')}")
+                return
             if existing_ticket:
                 existing_ticket.with_context(from_jira_sync=True).write(ticket_vals)
                 ticket_id = existing_ticket.id
@@ -430,6 +618,94 @@ class JiraConfiguration(models.Model):
 
             
 
+    def _find_existing_ticket(self, env, ticket):
+        # Moved issues keep their id, so match on it before the key
+        HelpdeskTicket = env['helpdesk.ticket'].with_context(active_test=False)
+        existing_ticket = HelpdeskTicket.browse()
+        if ticket.get('id'):
+            existing_ticket = HelpdeskTicket.search([('jira_id', '=', ticket['id'])], order='id', limit=1)
+        if not existing_ticket:
+            existing_ticket = HelpdeskTicket.search([('jira_key', '=', ticket.get('key'))], order='id', limit=1)
+        return existing_ticket
+
+    def _find_synced_attachment(self, env, ticket, name):
+        existing_ticket = self._find_existing_ticket(env, ticket)
+        if not existing_ticket:
+            return env['ir.attachment']
+        return env['ir.attachment'].search([
+            ('res_model', '=', 'helpdesk.ticket'),
+            ('res_id', '=', existing_ticket.id),
+            ('name', '=', name),
+        ], order='id desc', limit=1)
+
+    def _replay_jira_snapshots(self, batch_size=100):
+        self.ensure_one()
+        snapshot_ids = self.env['jira.issue.snapshot']._get_latest_snapshot_ids()
+        stage_cache = {}
+        user_cache = {}
+        replayed_count = 0
+        error_occurred = False
+
+        for start in range(0, len(snapshot_ids), batch_size):
+            # Decode in the main thread, workers open their own cursors
+            snapshots = []
+            for snapshot in self.env['jira.issue.snapshot'].browse(snapshot_ids[start:start + batch_size]):
+                existing_ticket = self._find_existing_ticket(
+                    self.env, {'id': snapshot.issue_id, 'key': snapshot.issue_key}
+                )
+                # Leave archived tickets alone and never undo a move or a newer sync
+                if existing_ticket and (
+                    not existing_ticket.active
+                    or existing_ticket.jira_deleted
+                    or existing_ticket.jira_key != snapshot.issue_key
+                    or (existing_ticket.jira_updated_date and snapshot.jira_updated < existing_ticket.jira_updated_date)
+                ):
+                    continue
+                snapshots.append((snapshot.issue_key, snapshot._load_issue(), snapshot._load_comments()))
+
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                futures = []
+                for issue_key, issue, comments in snapshots:
+                    future = executor.submit(
+                        self._process_single_ticket, issue, stage_cache, user_cache,
+                        comments=comments, issue_data=issue, offline=True,
+                    )
+                    futures.append((future, issue_key))
+
+                for future, issue_key in futures:
+                    try:
+                        future.result()
+                        replayed_count += 1
+                    except Exception as e:
+                        _logger.error(f"Error replaying Jira snapshot {issue_key}: {str(e)}")
+                        error_occurred = True
+
+        _logger.info(f"Jira snapshot replay: {replayed_count} of {len(snapshot_ids)} snapshots replayed")
+        return error_occurred
+
+    def action_replay_jira_snapshots(self):
+        self.ensure_one()
+        if not self.env.user.has_group('jira_connector.group_jira_manager'):
+            raise AccessError("Only Jira managers can replay snapshots.")
+
+        self.write({'replay_requested': True})
+        # Replaying can take hours, run it in the cron rather than in this request
+        cron = self.env.ref('jira_connector.ir_cron_replay_jira_snapshots')
+        cron.sudo().write({
+            'nextcall': fields.Datetime.now(),
+            'active': True
+        })
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Success',
+                'message': 'Jira snapshot replay has started. Your tickets will be updated shortly while you continue working.',
+                'type': 'success',
+            }
+        }
+
     def test_connection(self):
         self.ensure_one()
         response = self._make_request('myself')
@@ -452,6 +728,20 @@ class JiraConfiguration(models.Model):
         if active_config:
             active_config.sync_jira_projects()
             active_config._sync_jira_tickets()
+            self.env['jira.issue.snapshot']._cleanup_old_snapshots()
+
+    def _auto_reconcile_jira_tickets(self):
+        active_config = self.search([('is_active', '=', True)], limit=1)
+        if active_config:
+            active_config._reconcile_jira_tickets()
+
+    def _auto_replay_jira_snapshots(self):
+        for config in self.search([('replay_requested', '=', True)]):
+            # Commit the cleared request right away so a failing replay does not rerun
+            # every day and the config row is not locked for the whole replay
+            config.write({'replay_requested': False})
+            self.env.cr.commit()
+            config._replay_jira_snapshots()
 
 
     def sync_jira_data(self):
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from odoo import models, fields, api
+import base64
+import json
+import zlib
+import logging
+
+_logger = logging.getLogger(__name__)
+
+class JiraIssueSnapshot(models.Model):
+    _name = 'jira.issue.snapshot'
+    _description = 'Jira Issue Snapshot'
+    _order = 'issue_id, jira_updated desc'
+
+    issue_id = fields.Char('Jira ID', required=True, index=True)
+    issue_key = fields.Char('Jira Key', index=True)
+    jira_updated = fields.Datetime('Jira Updated', required=True)
+    issue_data = fields.Binary('Issue Data', attachment=False)
+    comments_data = fields.Binary('Comments Data', attachment=False)
+
+    _sql_constraints = [
+        ('unique_issue_updated',
+         'UNIQUE(issue_id,jira_updated)',
+         'Only one snapshot is allowed per Jira issue version!')
+    ]
+
+    @api.model
+    def _compress(self, data):
+        return base64.b64encode(zlib.compress(json.dumps(data).encode('utf-8')))
+
+    @api.model
+    def _decompress(self, data):
+        if not data:
+            return None
+        return json.loads(zlib.decompress(base64.b64decode(data)).decode('utf-8'))
+
+    @api.model
+    def _store_snapshot(self, issue, comments):
+        updated = issue.get('fields', {}).get('updated')
+        if not updated:
+            return self.browse()
+        try:
+            jira_updated = datetime.strptime(updated, '%Y-%m-%dT%H:%M:%S.%f%z').astimezone(timezone.utc).replace(tzinfo=None)
+        except ValueError:
+            _logger.error(f"Error parsing updated date for snapshot {issue.get('key', '')}: {updated}")
+            return self.browse()
+
+        # Nothing changed in Jira since the last stored version
+        existing_snapshot = self.search([
+            ('issue_id', '=', issue['id']),
+            ('jira_updated', '=', jira_updated),
+        ], limit=1)
+        if existing_snapshot:
+            return existing_snapshot
+
+        return self.create({
+            'issue_id': issue['id'],
+            'issue_key': issue.get('key', ''),
+            'jira_updated': jira_updated,
+            'issue_data': self._compress(issue),
+            'comments_data': self._compress(comments),
+        })
+
+    @api.model
+    def _get_latest_snapshot_ids(self):
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (issue_id) id
+              FROM jira_issue_snapshot
+          ORDER BY issue_id, jira_updated DESC
+        """)
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _cleanup_old_snapshots(self, keep_versions=3):
+        # Replay only needs the latest version, keep a few more to reproduce regressions
+        self.env.cr.execute("""
+            SELECT id
+              FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY issue_id ORDER BY jira_updated DESC) AS version
+                      FROM jira_issue_snapshot
+                   ) AS snapshot
+             WHERE version > %s
+        """, (keep_versions,))
+        old_snapshot_ids = [row[0] for row in self.env.cr.fetchall()]
+        if old_snapshot_ids:
+            self.browse(old_snapshot_ids).unlink()
+        return len(old_snapshot_ids)
+
+    def _load_issue(self):
+        self.ensure_one()
+        return self._decompress(self.issue_data)
+
+    def _load_comments(self):
+        self.ensure_one()
+        return self._decompress(self.comments_data) or []
@@ -9,9 +9,12 @@ class JiraProject(models.Model):
 
     def write(self, vals):
         result = super().write(vals)
-        for project in self:
-            if project.is_jira_project and project.jira_key:
-                project._update_jira_project(vals)
+
+        # Only update Jira if this write didn't come from Jira sync
+        if not self.env.context.get('from_jira_sync'):
+            for project in self:
+                if project.is_jira_project and project.jira_key:
+                    project._update_jira_project(vals)
         return result
         
     def _update_jira_project(self, vals):
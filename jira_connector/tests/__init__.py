@@ -0,0 +1,3 @@
+from . import test_jira_project_sync
+from . import test_jira_reconcile
+from . import test_jira_issue_snapshot
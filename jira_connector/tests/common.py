@@ -0,0 +1,26 @@
+from unittest.mock import MagicMock
+from odoo.tests.common import TransactionCase
+
+
+def mock_response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+class JiraTestCommon(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Inactive so it never clashes with a configuration already on the database,
+        # the tests call their methods on cls.config directly
+        cls.config = cls.env['jira.config'].create({
+            'name': 'Test Jira',
+            'url': 'https://example.atlassian.net',
+            'email': 'jira@example.com',
+            'api_token': 'token',
+            'is_active': False,
+        })
+        cls.HelpdeskTicket = cls.env['helpdesk.ticket'].with_context(active_test=False, from_jira_sync=True)
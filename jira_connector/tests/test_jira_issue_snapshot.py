@@ -0,0 +1,159 @@
+from unittest.mock import patch
+from odoo.exceptions import AccessError
+from odoo.tests.common import tagged
+
+from .common import JiraTestCommon, mock_response
+
+
+def _issue(issue_id='10001', key='ABC-1', updated='2026-10-01T10:00:00.000+0000'):
+    return {
+        'id': issue_id,
+        'key': key,
+        'fields': {
+            'summary': 'Printer on fire',
+            'description': 'The office printer is on fire.',
+            'status': {'name': 'New'},
+            'priority': {'name': 'High'},
+            'assignee': None,
+            'created': '2026-10-01T09:00:00.000+0000',
+            'updated': updated,
+            'attachment': [],
+        },
+    }
+
+
+def _comment(body='Still burning'):
+    return {
+        'id': '1',
+        'body': body,
+        'author': {'displayName': 'Support'},
+        'created': '2026-10-01T11:00:00.000+0000',
+    }
+
+
+@tagged('post_install', '-at_install')
+class TestJiraIssueSnapshot(JiraTestCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Snapshot = cls.env['jira.issue.snapshot']
+
+    def setUp(self):
+        super().setUp()
+        # _process_single_ticket opens and commits its own cursor, keep it inside the test transaction
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def test_compress_round_trip(self):
+        payload = {'issue': _issue(), 'comments': [_comment('Ünïcödé ✓')]}
+        compressed = self.Snapshot._compress(payload)
+        self.assertEqual(self.Snapshot._decompress(compressed), payload)
+        self.assertIsNone(self.Snapshot._decompress(False))
+
+    def test_store_snapshot_deduplicates_versions(self):
+        first = self.Snapshot._store_snapshot(_issue(), [_comment()])
+        again = self.Snapshot._store_snapshot(_issue(), [_comment('Changed')])
+        self.assertEqual(first, again)
+        self.assertEqual(first._load_comments(), [_comment()])
+
+        newer = self.Snapshot._store_snapshot(_issue(updated='2026-10-02T10:00:00.000+0000'), [])
+        self.assertNotEqual(first, newer)
+        self.assertEqual(self.Snapshot.search_count([('issue_id', '=', '10001')]), 2)
+        self.assertEqual(self.Snapshot._get_latest_snapshot_ids(), newer.ids)
+
+    def test_store_snapshot_requires_updated(self):
+        issue = _issue()
+        del issue['fields']['updated']
+        self.assertFalse(self.Snapshot._store_snapshot(issue, []))
+
+    def test_cleanup_keeps_latest_versions(self):
+        for day in range(1, 6):
+            self.Snapshot._store_snapshot(_issue(updated=f'2026-10-0{day}T10:00:00.000+0000'), [])
+
+        self.assertEqual(self.Snapshot._cleanup_old_snapshots(keep_versions=3), 2)
+        remaining = self.Snapshot.search([('issue_id', '=', '10001')])
+        self.assertEqual(len(remaining), 3)
+        self.assertEqual(remaining[0].jira_updated.day, 5)
+
+    def test_offline_processing_makes_no_requests(self):
+        with patch.object(type(self.config), '_make_request') as make_request:
+            self.config._process_single_ticket(
+                _issue(), {}, {}, comments=[_comment()], issue_data=_issue(), offline=True,
+            )
+        make_request.assert_not_called()
+
+        ticket = self.HelpdeskTicket.search([('jira_id', '=', '10001')])
+        self.assertEqual(ticket.name, 'Printer on fire')
+        self.assertEqual(str(ticket.jira_updated_date), '2026-10-01 10:00:00')
+        self.assertIn('Still burning', ticket.jira_comments)
+        # Replayed payloads are never stored again
+        self.assertFalse(self.Snapshot.search([('issue_id', '=', '10001')]))
+
+    def test_failed_comment_fetch_stores_no_snapshot(self):
+        def fake_request(endpoint, method='GET', data=None, stream=False):
+            if endpoint.endswith('/comment'):
+                return mock_response({}, status_code=500)
+            return mock_response(_issue())
+
+        with patch.object(type(self.config), '_make_request', side_effect=fake_request):
+            self.config._process_single_ticket(_issue(), {}, {})
+
+        self.assertTrue(self.HelpdeskTicket.search([('jira_id', '=', '10001')]))
+        self.assertFalse(self.Snapshot.search([('issue_id', '=', '10001')]))
+
+    def test_successful_fetch_stores_snapshot(self):
+        def fake_request(endpoint, method='GET', data=None, stream=False):
+            if endpoint.endswith('/comment'):
+                return mock_response({'comments': [_comment()]})
+            return mock_response(_issue())
+
+        with patch.object(type(self.config), '_make_request', side_effect=fake_request):
+            self.config._process_single_ticket(_issue(), {}, {})
+
+        snapshot = self.Snapshot.search([('issue_id', '=', '10001')])
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot._load_issue(), _issue())
+        self.assertEqual(snapshot._load_comments(), [_comment()])
+
+    def test_replay_skips_deleted_and_moved_tickets(self):
+        self.HelpdeskTicket.create({
+            'name': 'Deleted', 'jira_key': 'ABC-1', 'jira_id': '10001', 'is_jira_ticket': True,
+            'active': False, 'jira_deleted': True,
+        })
+        self.HelpdeskTicket.create({
+            'name': 'Moved', 'jira_key': 'XYZ-5', 'jira_id': '10002', 'is_jira_ticket': True,
+        })
+        self.Snapshot._store_snapshot(_issue(), [])
+        self.Snapshot._store_snapshot(_issue(issue_id='10002', key='ABC-2'), [])
+
+        with patch.object(type(self.config), '_process_single_ticket') as process_single_ticket:
+            self.config._replay_jira_snapshots()
+        process_single_ticket.assert_not_called()
+
+    def test_replay_skips_stale_snapshots(self):
+        ticket = self.HelpdeskTicket.create({
+            'name': 'Renamed after the snapshot', 'jira_key': 'ABC-1', 'jira_id': '10001', 'is_jira_ticket': True,
+            'jira_updated_date': '2026-10-02 10:00:00',
+        })
+        self.Snapshot._store_snapshot(_issue(), [])
+
+        with patch.object(type(self.config), '_process_single_ticket') as process_single_ticket:
+            self.config._replay_jira_snapshots()
+        process_single_ticket.assert_not_called()
+
+        # A snapshot racing a newer sync is dropped by the worker as well
+        with patch.object(type(self.config), '_make_request') as make_request:
+            self.config._process_single_ticket(_issue(), {}, {}, comments=[], issue_data=_issue(), offline=True)
+        make_request.assert_not_called()
+        ticket.invalidate_recordset()
+        self.assertEqual(ticket.name, 'Renamed after the snapshot')
+
+    def test_replay_requires_manager(self):
+        user = self.env['res.users'].create({
+            'name': 'Jira User',
+            'login': 'jira_user',
+            'groups_id': [(6, 0, [self.env.ref('jira_connector.group_jira_user').id])],
+        })
+        with self.assertRaises(AccessError):
+            self.config.with_user(user).action_replay_jira_snapshots()
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+from odoo.tests.common import tagged
+
+from .common import JiraTestCommon, mock_response
+
+
+@tagged('post_install', '-at_install')
+class TestJiraProjectSync(JiraTestCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.ProjectModel = cls.env['project.project'].with_context(from_jira_sync=True)
+        cls.unchanged_project = cls.ProjectModel.create({
+            'name': 'Alpha', 'jira_key': 'ALP', 'jira_id': '1', 'is_jira_project': True,
+        })
+        cls.renamed_project = cls.ProjectModel.create({
+            'name': 'Beta', 'jira_key': 'BET', 'jira_id': '2', 'is_jira_project': True,
+        })
+
+    def _sync(self):
+        pages = {
+            0: {'values': [
+                {'key': 'ALP', 'id': '1', 'name': 'Alpha'},
+                {'key': 'GAM', 'id': '3', 'name': 'Gamma'},
+            ], 'isLast': False},
+            2: {'values': [
+                {'key': 'BET', 'id': '2', 'name': 'Beta Renamed'},
+                {'key': 'DEL', 'id': '4', 'name': 'Delta'},
+            ], 'isLast': True},
+        }
+
+        def fake_request(endpoint, method='GET', data=None, stream=False):
+            self.assertTrue(endpoint.startswith('project/search'), endpoint)
+            start_at = int(endpoint.split('startAt=')[1].split('&')[0])
+            return mock_response(pages[start_at])
+
+        Project = type(self.env['project.project'])
+        with patch.object(type(self.config), '_make_request', side_effect=fake_request) as make_request, \
+                patch.object(Project, 'write', autospec=True, side_effect=Project.write) as write, \
+                patch.object(Project, 'create', autospec=True, side_effect=Project.create) as create, \
+                patch.object(Project, '_update_jira_project', autospec=True) as update_jira_project:
+            self.config.sync_jira_projects(batch_size=2)
+        return make_request, write, create, update_jira_project
+
+    def test_only_changed_projects_written(self):
+        make_request, write, create, update_jira_project = self._sync()
+
+        written = [(call.args[0], call.args[1]) for call in write.call_args_list]
+        self.assertFalse([vals for records, vals in written if self.unchanged_project in records])
+        self.assertEqual(
+            [vals for records, vals in written if self.renamed_project in records],
+            [{'name': 'Beta Renamed'}],
+        )
+        self.assertEqual(self.renamed_project.name, 'Beta Renamed')
+
+    def test_no_echo_to_jira(self):
+        make_request, write, create, update_jira_project = self._sync()
+
+        update_jira_project.assert_not_called()
+        self.assertEqual(make_request.call_count, 2)
+        for call in make_request.call_args_list:
+            self.assertNotEqual(call.kwargs.get('method', 'GET'), 'PUT')
+
+    def test_new_projects_created_in_one_batch(self):
+        make_request, write, create, update_jira_project = self._sync()
+
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(
+            sorted(vals['jira_key'] for vals in create.call_args.args[1]),
+            ['DEL', 'GAM'],
+        )
+        self.assertEqual(
+            self.env['project.project'].search_count([('jira_key', 'in', ['DEL', 'GAM'])]),
+            2,
+        )
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+from odoo.tests.common import tagged
+
+from .common import JiraTestCommon, mock_response
+
+
+@tagged('post_install', '-at_install')
+class TestJiraReconcile(JiraTestCommon):
+
+    def _create_ticket(self, jira_key, jira_id, **vals):
+        ticket = self.HelpdeskTicket.create(dict({
+            'name': jira_key,
+            'jira_key': jira_key,
+            'jira_id': jira_id,
+            'is_jira_ticket': True,
+        }, **vals))
+        # Synced well before the scan starts
+        self.env.cr.execute(
+            "UPDATE helpdesk_ticket SET create_date = now() at time zone 'UTC' - interval '1 day' WHERE id = %s",
+            (ticket.id,),
+        )
+        ticket.invalidate_recordset(['create_date'])
+        return ticket
+
+    def _reconcile(self, remote_issues, project_keys=('ABC', 'XYZ')):
+        def fake_request(endpoint, method='GET', data=None, stream=False):
+            if endpoint.startswith('project/search'):
+                return mock_response({'values': [{'key': key} for key in project_keys], 'isLast': True})
+            project_key = endpoint.split('project=')[1].split('&')[0]
+            issues = [
+                {'id': issue_id, 'key': issue_key}
+                for issue_id, issue_key in remote_issues
+                if issue_key.startswith(f'{project_key}-')
+            ]
+            return mock_response({'issues': issues, 'total': len(issues)})
+
+        with patch.object(type(self.config), '_make_request', side_effect=fake_request) as make_request:
+            self.config._reconcile_jira_tickets()
+        # Only key-only scans are allowed
+        for call in make_request.call_args_list:
+            endpoint = call.args[0]
+            self.assertTrue(endpoint.startswith('project/search') or 'fields=key' in endpoint)
+
+    def test_orphan_archived(self):
+        kept = self._create_ticket('ABC-1', '10001')
+        orphan = self._create_ticket('ABC-2', '10002')
+
+        self._reconcile([('10001', 'ABC-1')])
+
+        self.assertTrue(kept.active)
+        self.assertFalse(kept.jira_deleted)
+        self.assertFalse(orphan.active)
+        self.assertTrue(orphan.jira_deleted)
+
+    def test_deleted_ticket_restored(self):
+        ticket = self._create_ticket('ABC-1', '10001', active=False, jira_deleted=True)
+
+        self._reconcile([('10001', 'ABC-1')])
+
+        self.assertTrue(ticket.active)
+        self.assertFalse(ticket.jira_deleted)
+
+    def test_moved_issue_rekeyed(self):
+        ticket = self._create_ticket('ABC-1', '10001')
+
+        self._reconcile([('10001', 'XYZ-5')])
+
+        self.assertEqual(ticket.jira_key, 'XYZ-5')
+        self.assertTrue(ticket.active)
+        self.assertFalse(ticket.jira_deleted)
+
+    def test_moved_issue_duplicate_archived(self):
+        original = self._create_ticket('ABC-1', '10001')
+        duplicate = self._create_ticket('XYZ-5', '10001')
+
+        self._reconcile([('10001', 'XYZ-5')])
+
+        self.assertEqual(original.jira_key, 'XYZ-5')
+        self.assertTrue(original.active)
+        self.assertFalse(duplicate.active)
+        self.assertFalse(duplicate.jira_deleted)
+
+    def test_empty_scan_archives_nothing(self):
+        ticket = self._create_ticket('ABC-1', '10001')
+
+        self._reconcile([])
+
+        self.assertTrue(ticket.active)
+        self.assertFalse(ticket.jira_deleted)
+
+    def test_unscanned_project_untouched(self):
+        ticket = self._create_ticket('OLD-1', '20001')
+
+        self._reconcile([('10001', 'ABC-1')])
+
+        self.assertTrue(ticket.active)
+        self.assertFalse(ticket.jira_deleted)
+
+    def test_ticket_created_during_scan_untouched(self):
+        ticket = self._create_ticket('ABC-2', '10002')
+        # Synced by the ticket cron after its project was scanned
+        self.env.cr.execute(
+            "UPDATE helpdesk_ticket SET create_date = now() at time zone 'UTC' + interval '1 hour' WHERE id = %s",
+            (ticket.id,),
+        )
+        ticket.invalidate_recordset(['create_date'])
+
+        self._reconcile([('10001', 'ABC-1')])
+
+        self.assertTrue(ticket.active)
+        self.assertFalse(ticket.jira_deleted)
+
+    def test_mass_archive_aborted(self):
+        tickets = self.HelpdeskTicket.browse()
+        for number in range(1, 13):
+            tickets |= self._create_ticket(f'ABC-{number}', str(10000 + number))
+
+        self._reconcile([('10001', 'ABC-1')])
+
+        self.assertTrue(all(tickets.mapped('active')))
+        self.assertFalse(any(tickets.mapped('jira_deleted')))